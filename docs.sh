@@ -1,9 +1,9 @@
 #!/bin/sh
 rm -rf ./docs/*.html
-sed -i -e  '1,2d' ./src/amps/__init__.py
+cp ./src/amps/__init__.py ./src/amps/__init__.py.orig
+sed -i -e '1,2c\Atom = bytes' ./src/amps/__init__.py
 pdoc3 --html ./src/amps --output-dir ./docs --force --template-dir ./templates
 mv ./docs/amps/* ./docs
 mv ./docs/* ./mft-labs/documentation/docs
 rm -rf ./docs/amps
-echo 'from erlport.erlang import cast, call\nfrom erlport.erlterms import Atom' | cat - ./src/amps/__init__.py > temp && mv temp ./src/amps/__init__.py
-
+mv ./src/amps/__init__.py.orig ./src/amps/__init__.py
@@ -2,8 +2,99 @@ from erlport.erlang import cast, call
 from erlport.erlterms import Atom, Map, List
 import traceback
 import os
+import re
 import json
-import uuid
+import collections
+import threading
+import orjson
+
+
+# Note that orjson decodes integers wider than 64 bits as floats.
+_loads = orjson.loads
+
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _escape_non_ascii(match):
+    c = ord(match.group())
+    if c < 0x10000:
+        return '\\u%04x' % c
+    c -= 0x10000
+    return '\\u%04x\\u%04x' % (0xd800 | (c >> 10), 0xdc00 | (c & 0x3ff))
+
+
+def _dumps(obj):
+    # Payloads must stay ASCII-only, as json.dumps produced them, since they
+    # reach Erlang as charlists. Integers orjson cannot represent fall back
+    # to the stdlib encoder.
+    try:
+        encoded = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(obj)
+    if encoded.isascii():
+        return encoded
+    return _NON_ASCII.sub(_escape_non_ascii, encoded)
+
+
+_A_OK = Atom(b'ok')
+_A_LOG = Atom(b'log')
+_A_NEW = Atom(b'new')
+_A_SID = Atom(b'sid')
+_A_PYHANDLER = Atom(b'Elixir.Amps.PyHandler')
+_A_SEND_MESSAGE = Atom(b'send_message')
+
+_LEVEL_ATOMS = {level: Atom(bytes(level, "utf-8")) for level in (
+    "emergency", "alert", "critical", "error", "warning", "notice", "info", "debug")}
+
+_A_INFO = _LEVEL_ATOMS["info"]
+_A_ERROR = _LEVEL_ATOMS["error"]
+_A_DEBUG = _LEVEL_ATOMS["debug"]
+_A_WARNING = _LEVEL_ATOMS["warning"]
+
+
+def _level_atom(level):
+    atom = _LEVEL_ATOMS.get(level)
+    if atom is None:
+        atom = Atom(bytes(level, "utf-8"))
+    return atom
+
+
+def _data_size(data):
+    # fsize is a byte count. ASCII strings are the common case and their
+    # length already is their UTF-8 size, so only encode when needed.
+    if isinstance(data, str) and not data.isascii():
+        return len(data.encode("utf-8"))
+    return len(data)
+
+# Action failures only need the traceback encoded into the fixed skeleton.
+_ERROR_RESPONSE = '{"error":true,"reason":%s}'
+
+_UUID_POOL = collections.deque()
+_UUID_POOL_LOCK = threading.Lock()
+
+
+def _refill_uuids(n=256):
+    # Draw randomness for a batch of version 4 UUIDs in a single read and
+    # patch in the version and variant bits by hand.
+    buf = bytearray(os.urandom(16 * n))
+    ids = []
+    for i in range(0, len(buf), 16):
+        buf[i + 6] = (buf[i + 6] & 0x0f) | 0x40
+        buf[i + 8] = (buf[i + 8] & 0x3f) | 0x80
+        ids.append(buf[i:i + 16].hex())
+    _UUID_POOL.extend(ids)
+
+
+def _reset_uuid_pool():
+    # A forked child must not hand out IDs already pooled by its parent, and
+    # must not inherit the lock if the fork happened mid-refill.
+    global _UUID_POOL_LOCK
+    _UUID_POOL_LOCK = threading.Lock()
+    _UUID_POOL.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_uuid_pool)
 
 
 class Util:
@@ -11,10 +102,17 @@ class Util:
 
 
     """
+    @staticmethod
     def get_id():
         """Utility method that returns a unique ID in the format used by AMPS.
         """
-        return uuid.UUID(str(uuid.uuid4())).hex
+        while True:
+            try:
+                return _UUID_POOL.popleft()
+            except IndexError:
+                with _UUID_POOL_LOCK:
+                    if not _UUID_POOL:
+                        _refill_uuids()
 
     @staticmethod
     def unravel_erlport_object(result):
@@ -42,6 +140,7 @@ class Logger:
             # Perform Action Logic Here
     ```
     """
+    __slots__ = ("__sid__", "__service__")
 
     def __init__(self, sid="", service=None):
         self.__sid__ = sid
@@ -63,12 +162,14 @@ class Logger:
                 # Perform Action Logic Here
         ```
         """
+        self.__emit__(_level_atom(level), message)
+
+    def __emit__(self, level, message):
         if self.__service__:
-            self.__service__.__log__(Atom(
-                bytes(level, "utf-8")), message)
+            self.__service__.__log__(level, message)
         else:
-            call(Atom(b'Elixir.Amps.PyHandler'), Atom(b'log'), [Atom(
-                bytes(level, "utf-8")), message, [(Atom(b'sid'), self.__sid__)]])
+            call(_A_PYHANDLER, _A_LOG, [level,
+                 message, [(_A_SID, self.__sid__)]])
 
     def info(self, message: str):
         """Instance method that logs a given message with the "info" level.
@@ -85,7 +186,7 @@ class Logger:
                 # Perform Action Logic Here
         ```
         """
-        self.log("info", message)
+        self.__emit__(_A_INFO, message)
 
     def debug(self, message: str):
         """Instance method that logs a given message with the "debug" level.
@@ -102,7 +203,7 @@ class Logger:
                 self.logger.debug("Received message")
         ```
         """
-        self.log("debug", message)
+        self.__emit__(_A_DEBUG, message)
 
     def warning(self, message: str):
         """Instance method that logs a given message with the "warning" level.
@@ -119,7 +220,7 @@ class Logger:
                 self.logger.warning("Something minor went wrong.")
         ```
         """
-        self.log("warning", message)
+        self.__emit__(_A_WARNING, message)
 
     def error(self, message: str):
         """Instance method that logs a given message with the "error" level.
@@ -136,7 +237,7 @@ class Logger:
                 self.logger.error("Something major went wrong.")
         ```
         """
-        self.log("error", message)
+        self.__emit__(_A_ERROR, message)
 
 
 class DB:
@@ -284,7 +385,7 @@ class Action:
     """
 
     def __init__(self, msgdata):
-        msgdata = json.loads(msgdata)
+        msgdata = _loads(msgdata)
         self.msg = msgdata["msg"]
         self.parms = msgdata["parms"]
         self.sysparms = msgdata["sysparms"]
@@ -303,14 +404,16 @@ class Action:
     def __run__(self):
         try:
             response = self.action()
+            if isinstance(response, bytes):
+                return response.decode()
+            return _dumps(response)
         except Exception as e:
-            response = {"error": True, "reason": traceback.format_exc()}
-        return json.dumps(response)
+            return _ERROR_RESPONSE % _dumps(traceback.format_exc())
 
     def action(self):
         """Callback to override in order to perform action logic in a class that extends `Action`.
 
-        Relevant message data is available via the attributes available on the self object. It expects the method to return a python dictionary with at least a "status" key with the status of the action execution. If the action execution is unsuccessful, a "reason" key can also be returned along with an unsuccessful status. If a new message is intended to be created by this action, it is also expected that a "msg" key will be returned with a dictionary object containing either a "data" key with inline data or an "fpath" key containing the file path to the message. Similarly, actions used in Endpoints can return a "response" object with the response status code specified under the "code" key, and the response body provided via either the "data" or "fpath" key. The action method is automatically wrapped in a try-except block when it is called, so is unnecessary to wrap the overall method in a try-except block. If you wish to have more granular visibility over errors that arise in your actions, feel free to use try-except blocks at various steps throughout action execution to allow for logging specific reasons for failure. To simplify action creation and handling, a number of helper methods are exposed by the class as static methods.
+        Relevant message data is available via the attributes available on the self object. It expects the method to return a python dictionary with at least a "status" key with the status of the action execution. If the action execution is unsuccessful, a "reason" key can also be returned along with an unsuccessful status. If a new message is intended to be created by this action, it is also expected that a "msg" key will be returned with a dictionary object containing either a "data" key with inline data or an "fpath" key containing the file path to the message. Similarly, actions used in Endpoints can return a "response" object with the response status code specified under the "code" key, and the response body provided via either the "data" or "fpath" key. If the action has already JSON-encoded its return value, it may return the encoded bytes directly and they will be passed through without being encoded again. Such bytes must be UTF-8 encoded JSON. The action method is automatically wrapped in a try-except block when it is called, so is unnecessary to wrap the overall method in a try-except block. If you wish to have more granular visibility over errors that arise in your actions, feel free to use try-except blocks at various steps throughout action execution to allow for logging specific reasons for failure. To simplify action creation and handling, a number of helper methods are exposed by the class as static methods.
 
         Usage:
         ```
@@ -326,9 +429,12 @@ class Action:
         """
         return {"status": "completed"}
 
-    def get_data(self):
+    def get_data(self, binary: bool = False):
         """Convenience method to read get string data from message.
 
+        Args:
+            binary (boolean): Whether to return the data as bytes instead of a string. Reading a file in binary mode skips decoding it, which is faster and uses less memory for large or non-text payloads.
+
         Returns either the inline message data stored on the "data" key or the data stored in the message's file via the "fpath" key.
         Usage:
         ```
@@ -345,9 +451,13 @@ class Action:
         ```
         """
         if self.msg.get("data"):
-            return self.msg["data"]
+            data = self.msg["data"]
+            if binary and isinstance(data, str):
+                return data.encode("utf-8")
+            return data
         else:
-            return open(self.msg["fpath"]).read()
+            with open(self.msg["fpath"], "rb" if binary else "r") as f:
+                return f.read()
 
     @staticmethod
     def send_async(status, key, data):
@@ -381,7 +491,6 @@ class Action:
         Args:
             status (string): The Action status to log.
             reason (string): An optional reason to provide along with the given status.
-
         Usage:
         ```
         from amps import Action
@@ -423,10 +532,12 @@ class Action:
         ```
         """
         fname = os.path.basename(fpath)
-        fsize = os.path.getsize(fpath)
-        msg = {**{"fname": fname, "fsize": fsize, "fpath": fpath}, **meta}
+        fsize = os.stat(fpath).st_size
+        msg = {"fname": fname, "fsize": fsize, "fpath": fpath}
+        msg.update(meta)
         return {"status": status, "msgs": [msg]}
     
+    @staticmethod
     def send_files(status: str, files: list):
         """Static method for creating a dictionary with the provided status and new messages from the provided dicts with fpaths and additional metadata for returning in the `Action.action` callback.
 
@@ -451,12 +562,14 @@ class Action:
         msgs = []
         for file in files:
             fname = os.path.basename(file["fpath"])
-            fsize = os.path.getsize(file["fpath"])
+            fsize = os.stat(file["fpath"]).st_size
             if file.get("meta"):
                 meta = file["meta"]
             else:
                 meta = {}
-            msgs.append({**{"fname": fname, "fsize": fsize, "fpath": file["fpath"]}, **meta})
+            msg = {"fname": fname, "fsize": fsize, "fpath": file["fpath"]}
+            msg.update(meta)
+            msgs.append(msg)
         return {"status": status, "msgs": msgs}
 
 
@@ -483,7 +596,8 @@ class Action:
                     return Action.send_status("failed", "Reason for Failure")
         ```
         """
-        msg = {**{"data": data}, **meta}
+        msg = {"data": data}
+        msg.update(meta)
         return {"status": status, "msgs": [msg]}
 
     @staticmethod
@@ -542,6 +656,7 @@ class Endpoint(Action):
         self.path_params = self.msg.get("path_params")
         self.query_params = self.msg.get("query_params")
 
+    @staticmethod
     def send_resp_data(data: str, code: int):
         """Static method for creating a dictionary with the provided inline data and status code in the "response" object for returning in the `Action.action` callback.
 
@@ -564,6 +679,7 @@ class Endpoint(Action):
         """
         return {"status": "completed", "response": {"data": data, "code": code}}
 
+    @staticmethod
     def send_resp_file(fpath, code):
         """Static method for creating a dictionary with the provided file path and status code in the "response" object for returning in the `Action.action` callback.
 
@@ -595,7 +711,7 @@ class Service:
     """The `Service` class from AMPS provides a base class for custom python services that can be managed by AMPS, and act as both consumers of messages and producers of new messages.
 
     Attributes:
-        parms (dict): The parms attribute contains all the parameters of the configured service.
+        parms (dict): The parms attribute contains all the parameters of the configured service. Changes made to parms in `Service.initialize` are included in messages sent with `Service.send_message`, but parms should be treated as read-only once initialization has finished.
         sysparms (dict): The sysparms attribute contains all useful system configuration parameters for use in services. Currently, sysparms only contains the AMPS temporary directory under the "tempdir" key.
         config (dict): The config attribute contains all the custom configuration provided when creating the service. All config is also available in the parms attribute under the "config" key.
         logger (Logger): The logger attribute exposes a Logger object for logging events back to AMPS. Any messages logged using this object during the message handling or creation will appear in the corresponding session logs.
@@ -630,26 +746,32 @@ class Service:
     """
 
     def __init__(self, parms, sysparms, pid, env, lhandler):
-        self.parms = json.loads(parms)
-        self.sysparms = json.loads(sysparms)
+        self.parms = _loads(parms)
+        self.__parms_json__ = _dumps(self.parms)
+        self.__received__ = f'Message received by Custom Service {self.parms["name"]}'
+        self.sysparms = _loads(sysparms)
         self.config = self.parms["config"]
         self.env = env
         self.logger = Logger(service=self)
         self.__pid__ = pid
         self.__lhandler__ = lhandler
         self.initialize()
+        # Pick up any changes made to parms during initialization.
+        self.__parms_json__ = _dumps(self.parms)
 
     def __receive__(self, data):
         try:
-            msg = json.loads(data)
+            msg = _loads(data)
+        except orjson.JSONDecodeError as e:
+            return (_A_ERROR, str(e))
+        try:
             logger = Logger(sid=msg["sid"])
 
-            logger.info(
-                f'Message received by Custom Service {self.parms["name"]}')
+            logger.info(self.__received__)
             resp = self.handle_message(msg, logger)
-            return (Atom(b'ok'), resp)
         except Exception as e:
-            return (Atom(b'error'), str(e))
+            return (_A_ERROR, str(e))
+        return (_A_OK, resp)
 
     def __response__(self, resp, id):
         global responses
@@ -671,10 +793,10 @@ class Service:
         global responses
         cast(self.__pid__, (msg, id))
         resp = self.__await_response__(id)
-        return json.loads(resp)
+        return _loads(resp)
 
     def __log__(self, level, msg):
-        cast(self.__lhandler__, (Atom(b'log'), (level, msg)))
+        cast(self.__lhandler__, (_A_LOG, (level, msg)))
 
     def initialize(self):
         """Instance method for performing any initialization logic and starting any subprocesses.  
@@ -719,14 +841,16 @@ class Service:
         msgid = Util.get_id()
         newmsg['parent'] = msg['msgid']
         newmsg['msgid'] = msgid
+        merged = {**msg, **newmsg}
         if "data" in newmsg:
-            del msg["fpath"]
-            newmsg["fsize"] = len(newmsg["data"])
+            if "fpath" not in newmsg:
+                merged.pop("fpath", None)
+            merged["fsize"] = _data_size(newmsg["data"])
         elif "fpath" in newmsg:
-            del msg["data"]
-            newmsg["fsize"] = os.path.getsize(newmsg["fpath"])
-        call(Atom(b'Elixir.Amps.PyHandler'), Atom(b'send_message'),
-             [json.dumps({**msg, **newmsg}), json.dumps(self.parms), self.env])
+            merged.pop("data", None)
+            merged["fsize"] = os.stat(newmsg["fpath"]).st_size
+        call(_A_PYHANDLER, _A_SEND_MESSAGE,
+             [_dumps(merged), self.__parms_json__, self.env])
         return msgid
 
     def send_new(self, newmsg: dict, action: str, response=False, timeout=15000):
@@ -759,11 +883,11 @@ class Service:
         msgid = Util.get_id()
         newmsg['msgid'] = msgid
         if "data" in newmsg:
-            newmsg["fsize"] = len(newmsg["data"])
+            newmsg["fsize"] = _data_size(newmsg["data"])
         else:
-            newmsg["fsize"] = os.path.getsize(newmsg["fpath"])
-        resp = self.__send_and_receive__((Atom(
-            b'new'), json.dumps(newmsg), action, response, timeout))
+            newmsg["fsize"] = os.stat(newmsg["fpath"]).st_size
+        resp = self.__send_and_receive__((
+            _A_NEW, _dumps(newmsg), action, response, timeout))
         return resp
 
     def create_session(self, user={}):
@@ -792,7 +916,7 @@ class Service:
         ```
         """
         resp = self.__send_and_receive__((Atom(
-            b'authenticate'), json.dumps(user)))
+            b'authenticate'), _dumps(user)))
         return resp
 
     def renew_session(self, renewal_token: str):